@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+# Imported first so startup timing covers Flask and the blueprint imports.
+from utils import startup  # noqa: I001
+
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 
@@ -7,6 +10,8 @@ from routes.data_routes import bp as data_bp
 from routes.preprocessing_routes import bp as preprocessing_bp
 from routes.model_routes import bp as model_bp
 from routes.pipeline_routes import bp as pipeline_bp
+from routes.system_routes import bp as system_bp
+from services.data_service import DataService
 
 
 def create_app() -> Flask:
@@ -19,6 +24,7 @@ def create_app() -> Flask:
     app.register_blueprint(preprocessing_bp)
     app.register_blueprint(model_bp)
     app.register_blueprint(pipeline_bp)
+    app.register_blueprint(system_bp)
 
     @app.get("/")
     def index():
@@ -32,10 +38,18 @@ def create_app() -> Flask:
         except Exception:
             return send_from_directory(app.static_folder, "index.html")
 
-
+    startup.mark_app_ready()
     return app
 
 
+# PRELOAD_HEAVY_MODULES=1 imports pandas/numpy/sklearn and parses the bundled sample
+# datasets up front. Combined with gunicorn's preload_app (see gunicorn.conf.py) this
+# happens once in the master and every forked worker shares those pages instead of
+# importing and parsing on first request.
+if startup.env_flag("PRELOAD_HEAVY_MODULES"):
+    startup.preload_heavy_modules()
+    DataService.preload_samples()
+
 app = create_app()
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+
+from utils import startup
+
+
+# Preload the app (and, via PRELOAD_HEAVY_MODULES, pandas/numpy/sklearn) in the master
+# so forked workers share those pages copy-on-write and boot without re-importing.
+# Set GUNICORN_PRELOAD=0 to go back to per-worker imports.
+preload_app = startup.env_flag("GUNICORN_PRELOAD", default=True)
+if preload_app:
+    os.environ.setdefault("PRELOAD_HEAVY_MODULES", "1")
+
+
+def post_fork(server, worker) -> None:
+    startup.mark_worker_forked()
+
+
+def post_worker_init(worker) -> None:
+    from routes.pipeline_routes import start_sweeper
+
+    # Sweep threads are per process and do not survive fork, so each worker starts its own.
+    start_sweeper()
+    startup.mark_worker_ready()
+    report = startup.startup_report()
+    rss = report["memory"]["rss"]
+    pss = report["memory"]["pss"]
+    worker.log.info(
+        "Worker %s ready in %.3fs (preloaded=%s, rss=%s, pss=%s)",
+        report["pid"],
+        report["worker_boot_seconds"] or 0.0,
+        report["preloaded"],
+        f"{rss / 2**20:.1f}MiB" if rss is not None else "n/a",
+        f"{pss / 2**20:.1f}MiB" if pss is not None else "n/a",
+    )
+
+
+def when_ready(server) -> None:
+    report = startup.startup_report()
+    if report["app_ready_seconds"] is None:
+        server.log.info("Master ready; app is loaded in each worker")
+        return
+    server.log.info(
+        "Master ready: app loaded in %.3fs (heavy module preload %s)",
+        report["app_ready_seconds"],
+        f"{report['preload_seconds']:.3f}s" if report["preload_seconds"] is not None else "skipped",
+    )
@@ -7,7 +7,8 @@ from typing import Any, Dict
 from flask import Blueprint, jsonify, request
 from werkzeug.utils import secure_filename
 
-from services.data_service import DataService
+from services.data_service import SAMPLE_DATA_DIR, DataService
+from services.ingestion_service import IngestionService
 from services.storage import STORE
 from utils.validators import ValidationError, validate_file_extension
 
@@ -15,11 +16,6 @@ from utils.validators import ValidationError, validate_file_extension
 bp = Blueprint("data", __name__, url_prefix="/api/data")
 
 
-def _backend_data_dir() -> str:
-    # backend/routes -> backend
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-
-
 def _sample_label_from_filename(filename: str) -> str:
     base = os.path.splitext(os.path.basename(filename))[0]
     # iris_dataset -> Iris dataset
@@ -45,40 +41,49 @@ def upload() -> Any:
     suffix = os.path.splitext(filename)[1].lower()
     tmp_dir = tempfile.gettempdir()
     tmp_path = os.path.join(tmp_dir, f"upload_{os.urandom(8).hex()}{suffix}")
-    file.save(tmp_path)
 
     try:
-        df = DataService.load_dataframe_from_file(tmp_path)
-    except Exception as e:
-        return jsonify({"error": f"Failed to parse file: {e}"}), 400
-    finally:
+        # Hash while spooling to disk; identical content reuses the already-parsed frame.
+        digest = DataService.save_and_hash(file.stream, tmp_path)
+    except OSError as e:
         try:
             os.remove(tmp_path)
         except OSError:
             pass
+        return jsonify({"error": f"Failed to save file: {e}"}), 400
 
-    dataset_id = DataService.store_dataset(df)
-    info = DataService.get_dataset_info(dataset_id)
+    # Parsing happens in the background; poll /ingestions/<job_id> for progress.
+    # The job owns tmp_path from here on and removes it when it finishes.
+    STORE.sweep_ingestions()
+    job = IngestionService.start(tmp_path, filename, digest)
+    snap = job.snapshot
+    return jsonify(snap.to_dict()), 200 if snap.status == "success" else 202
+
+
+@bp.get("/ingestions/<job_id>")
+def ingestion_status(job_id: str) -> Any:
+    job = STORE.find_ingestion(job_id)
+    if job is None:
+        return jsonify({"error": "Ingestion job not found"}), 404
+    return jsonify(job.snapshot.to_dict())
+
+
+@bp.post("/ingestions/<job_id>/cancel")
+def cancel_ingestion(job_id: str) -> Any:
+    job = STORE.find_ingestion(job_id)
+    if job is None:
+        return jsonify({"error": "Ingestion job not found"}), 404
 
-    return jsonify({"dataset_id": dataset_id, "info": info})
+    job.cancel_requested = True
+    return jsonify({"job_id": job_id, "status": "cancelling"})
 
 
 @bp.get("/samples")
 def list_samples() -> Any:
-    data_dir = _backend_data_dir()
-    if not os.path.isdir(data_dir):
-        return jsonify({"samples": []})
-
-    samples = []
-    for name in sorted(os.listdir(data_dir)):
-        path = os.path.join(data_dir, name)
-        if not os.path.isfile(path):
-            continue
-        lower = name.lower()
-        if not (lower.endswith(".csv") or lower.endswith(".xlsx") or lower.endswith(".xls")):
-            continue
-        samples.append({"filename": name, "label": _sample_label_from_filename(name)})
-
+    samples = [
+        {"filename": name, "label": _sample_label_from_filename(name)}
+        for name in DataService.list_sample_files()
+    ]
     return jsonify({"samples": samples})
 
 
@@ -97,7 +102,7 @@ def load_sample() -> Any:
     except ValidationError as e:
         return jsonify({"error": str(e)}), 400
 
-    data_dir = _backend_data_dir()
+    data_dir = SAMPLE_DATA_DIR
     path = os.path.abspath(os.path.join(data_dir, filename))
 
     # Ensure the resolved path is still inside backend/data.
@@ -108,25 +113,39 @@ def load_sample() -> Any:
         return jsonify({"error": "Sample not found"}), 404
 
     try:
-        df = DataService.load_dataframe_from_file(path)
+        dataset_id = DataService.load_sample(filename)
     except Exception as e:
         return jsonify({"error": f"Failed to parse sample: {e}"}), 400
 
-    dataset_id = DataService.store_dataset(df)
     info = DataService.get_dataset_info(dataset_id)
     return jsonify({"dataset_id": dataset_id, "info": info, "fileName": filename})
 
 
 @bp.get("/<dataset_id>/preview")
 def preview(dataset_id: str) -> Any:
-    if not STORE.has_dataset(dataset_id):
+    df = STORE.find_dataset(dataset_id)
+    if df is None:
         return jsonify({"error": "Dataset not found"}), 404
 
     n = request.args.get("n", default=10, type=int)
-    data, columns = DataService.get_preview(dataset_id, n_rows=max(1, min(n, 200)))
+    data, columns = DataService.get_preview(df, n_rows=max(1, min(n, 200)))
     return jsonify({"data": data, "columns": columns})
 
 
+@bp.delete("/<dataset_id>")
+def release(dataset_id: str) -> Any:
+    if not STORE.has_dataset(dataset_id):
+        return jsonify({"error": "Dataset not found"}), 404
+
+    # Identical uploads share one dataset, so this only frees it once every
+    # holder has released its reference. References held by pipeline runs
+    # cannot be dropped from here.
+    if STORE.client_refcount(dataset_id) <= 0:
+        return jsonify({"error": "Dataset has no releasable references (sample or in use by a pipeline)"}), 409
+    freed = STORE.release_dataset(dataset_id)
+    return jsonify({"dataset_id": dataset_id, "freed": freed})
+
+
 @bp.post("/split")
 def split() -> Any:
     body: Dict[str, Any] = request.get_json(silent=True) or {}
@@ -134,7 +153,8 @@ def split() -> Any:
     test_size = float(body.get("test_size", 0.2))
     random_state = body.get("random_state", None)
 
-    if not dataset_id or not STORE.has_dataset(dataset_id):
+    df = STORE.find_dataset(dataset_id) if dataset_id else None
+    if df is None:
         return jsonify({"error": "Invalid dataset_id"}), 400
 
     if not (0.05 <= test_size <= 0.95):
@@ -142,7 +162,6 @@ def split() -> Any:
 
     from sklearn.model_selection import train_test_split
 
-    df = STORE.get_dataset(dataset_id)
     train_df, test_df = train_test_split(
         df,
         test_size=test_size,
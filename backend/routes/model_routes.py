@@ -22,9 +22,11 @@ def train() -> Any:
     feature_columns = body.get("feature_columns") or []
     hyperparameters = body.get("hyperparameters") or {}
 
-    if not train_id or not STORE.has_dataset(train_id):
+    train_df = STORE.find_dataset(train_id) if train_id else None
+    test_df = STORE.find_dataset(test_id) if test_id else None
+    if train_df is None:
         return jsonify({"error": "Invalid train_dataset_id"}), 400
-    if not test_id or not STORE.has_dataset(test_id):
+    if test_df is None:
         return jsonify({"error": "Invalid test_dataset_id"}), 400
     if not model_type:
         return jsonify({"error": "Missing model_type"}), 400
@@ -33,8 +35,8 @@ def train() -> Any:
 
     try:
         result = ModelService.train(
-            STORE.get_dataset(train_id),
-            STORE.get_dataset(test_id),
+            train_df,
+            test_df,
             model_type=model_type,
             target_column=target_column,
             feature_columns=list(feature_columns),
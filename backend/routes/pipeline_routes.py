@@ -1,24 +1,97 @@
 from __future__ import annotations
 
+import json
+import logging
+import os
 import threading
+import time
 import uuid
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from flask import Blueprint, jsonify, request
 
 from services.data_service import DataService
 from services.model_service import ModelService
 from services.preprocessing_service import PreprocessingService
-from services.storage import ExecutionState, STORE
+from services.storage import SWEEP_INTERVAL_SECONDS, ExecutionState, STORE
 
 
 bp = Blueprint("pipeline", __name__, url_prefix="/api/pipeline")
+log = logging.getLogger(__name__)
+
+_sweeper_lock = threading.Lock()
+_sweeper_pid: Optional[int] = None
 
 
 def _new_id(prefix: str) -> str:
     return f"{prefix}_{uuid.uuid4().hex}" 
 
 
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _compact_results(st: ExecutionState) -> int:
+    """Trim bulky, display-only parts of a finished execution's node results.
+
+    Metrics, confusion matrices and ids are kept; dataset previews, before/after
+    statistics and per-class reports are dropped. The results node shares the
+    model node's payload, so it is compacted once. Returns the bytes saved,
+    measured as serialized JSON.
+    """
+    current = st.snapshot.results_per_node
+    before = _json_size(dict(current))
+    compacted: Dict[int, Any] = {}
+    results: Dict[str, Any] = {}
+
+    for nid, result in current.items():
+        if id(result) in compacted:
+            results[nid] = compacted[id(result)]
+            continue
+
+        slim = result
+        if isinstance(result, dict):
+            slim = {k: v for k, v in result.items() if k not in ("statistics", "classification_report")}
+            info = slim.get("info")
+            if isinstance(info, dict):
+                slim["info"] = {k: v for k, v in info.items() if k not in ("preview", "preview_columns")}
+        compacted[id(result)] = slim
+        results[nid] = slim
+
+    st.publish(results=results)
+    return max(0, before - _json_size(results))
+
+
+def _sweep() -> None:
+    start_sweeper()
+    STORE.sweep_executions(_compact_results)
+
+
+def _sweep_loop() -> None:
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            STORE.sweep_executions(_compact_results)
+            STORE.sweep_ingestions()
+        except Exception:
+            log.exception("Store sweep failed")
+
+
+def start_sweeper() -> None:
+    """Start this process's background sweep thread, once.
+
+    Request-driven sweeps only run while the worker is busy; the thread keeps
+    compacting and expiring executions when it goes idle. Threads do not survive
+    fork, so the check is per pid: gunicorn starts one in each worker after boot.
+    """
+    global _sweeper_pid
+    with _sweeper_lock:
+        if _sweeper_pid == os.getpid():
+            return
+        _sweeper_pid = os.getpid()
+    threading.Thread(target=_sweep_loop, name="store-sweeper", daemon=True).start()
+
+
 def _toposort(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> List[str]:
     node_ids = {n["id"] for n in nodes}
     incoming = {nid: 0 for nid in node_ids}
@@ -53,21 +126,31 @@ def execute() -> Any:
     body: Dict[str, Any] = request.get_json(silent=True) or {}
     nodes: List[Dict[str, Any]] = body.get("nodes", [])
     edges: List[Dict[str, Any]] = body.get("connections", [])
+    # Optional cap on threads for this execution's training; see services.cpu_budget.
+    cpu_budget = body.get("cpu_budget")
+    if cpu_budget not in (None, ""):
+        try:
+            cpu_budget = max(1, int(cpu_budget))
+        except (TypeError, ValueError):
+            return jsonify({"error": "cpu_budget must be a positive integer"}), 400
+    else:
+        cpu_budget = None
 
     execution_id = _new_id("exec")
-    state = ExecutionState(execution_id=execution_id, status="queued")
+    state = ExecutionState(execution_id=execution_id)
 
     # initialize node status
-    for n in nodes:
-        nid = n.get("id")
-        if nid:
-            state.node_status[nid] = "queued"
+    state.publish(status="queued", node_status={n["id"]: "queued" for n in nodes if n.get("id")})
 
     STORE.put_execution(state)
+    _sweep()
 
     def run() -> None:
-        st = STORE.get_execution(execution_id)
-        st.status = "running"
+        # Only this thread writes the execution, and every change goes out through
+        # st.publish(), so pollers always read a complete, consistent snapshot.
+        st = state
+        st.publish(status="running")
+        nid = None
 
         try:
             ordered = _toposort(nodes, edges)
@@ -77,22 +160,23 @@ def execute() -> Any:
 
             for nid in ordered:
                 if st.cancel_requested:
-                    st.status = "cancelled"
-                    st.node_status[nid] = "cancelled"
+                    st.publish(status="cancelled", node_status={nid: "cancelled"})
                     return
 
                 node = node_map[nid]
                 ntype = node.get("type")
                 config = node.get("config", {})
 
-                st.node_status[nid] = "running"
+                st.publish(node_status={nid: "running"})
 
                 if ntype == "dataUpload":
                     dataset_id = config.get("dataset_id")
-                    if not dataset_id or not STORE.has_dataset(dataset_id):
+                    # Hold a reference so the input cannot be released mid-run.
+                    if not dataset_id or not STORE.hold_dataset(dataset_id):
                         raise ValueError("Data Upload node is missing a valid dataset_id. Upload a file first.")
+                    st.owned_datasets.append(dataset_id)
                     context["dataset_id"] = dataset_id
-                    st.results_per_node[nid] = {"dataset_id": dataset_id, "info": DataService.get_dataset_info(dataset_id)}
+                    node_result = {"dataset_id": dataset_id, "info": DataService.get_dataset_info(dataset_id)}
 
                 elif ntype == "preprocessing":
                     dataset_id = context.get("dataset_id")
@@ -101,8 +185,10 @@ def execute() -> Any:
 
                     operations = config.get("operations", [])
                     result = PreprocessingService.apply(dataset_id, operations)
+                    STORE.adopt_dataset(result["processed_dataset_id"])
+                    st.owned_datasets.append(result["processed_dataset_id"])
                     context["dataset_id"] = result["processed_dataset_id"]
-                    st.results_per_node[nid] = result
+                    node_result = result
 
                 elif ntype == "trainTestSplit":
                     dataset_id = context.get("dataset_id")
@@ -123,9 +209,12 @@ def execute() -> Any:
                     )
                     train_id = DataService.store_dataset(train_df.reset_index(drop=True))
                     test_id = DataService.store_dataset(test_df.reset_index(drop=True))
+                    for owned_id in (train_id, test_id):
+                        STORE.adopt_dataset(owned_id)
+                    st.owned_datasets.extend([train_id, test_id])
                     context["train_dataset_id"] = train_id
                     context["test_dataset_id"] = test_id
-                    st.results_per_node[nid] = {
+                    node_result = {
                         "train_dataset_id": train_id,
                         "test_dataset_id": test_id,
                         "train_size": int(train_df.shape[0]),
@@ -150,26 +239,30 @@ def execute() -> Any:
                         target_column=target_column,
                         feature_columns=feature_columns,
                         hyperparameters=hyperparameters,
+                        max_threads=cpu_budget,
                     )
+                    st.owned_models.append(result["model_id"])
                     context["model_result"] = result
-                    st.results_per_node[nid] = result
+                    node_result = result
 
                 elif ntype == "results":
                     model_result = context.get("model_result")
                     if not model_result:
                         raise ValueError("Results node has no model result")
-                    st.results_per_node[nid] = model_result
+                    node_result = model_result
 
                 else:
                     raise ValueError(f"Unknown node type: {ntype}")
 
-                st.node_status[nid] = "success"
+                st.publish(node_status={nid: "success"}, results={nid: node_result})
 
-            st.status = "success"
+            st.publish(status="success")
 
         except Exception as e:
-            st.status = "error"
-            st.message = str(e)
+            failed = {nid: "error"} if nid is not None else None
+            st.publish(status="error", message=str(e), node_status=failed)
+        finally:
+            st.finished_at = time.time()
 
     threading.Thread(target=run, daemon=True).start()
 
@@ -178,26 +271,19 @@ def execute() -> Any:
 
 @bp.get("/<execution_id>/status")
 def status(execution_id: str) -> Any:
-    if not STORE.has_execution(execution_id):
+    st = STORE.find_execution(execution_id)
+    if st is None:
         return jsonify({"error": "Execution not found"}), 404
 
-    st = STORE.get_execution(execution_id)
-    return jsonify(
-        {
-            "execution_id": st.execution_id,
-            "status": st.status,
-            "message": st.message,
-            "node_status": st.node_status,
-            "results_per_node": st.results_per_node,
-        }
-    )
+    _sweep()
+    return jsonify(st.snapshot.to_dict())
 
 
 @bp.post("/<execution_id>/cancel")
 def cancel(execution_id: str) -> Any:
-    if not STORE.has_execution(execution_id):
+    st = STORE.find_execution(execution_id)
+    if st is None:
         return jsonify({"error": "Execution not found"}), 404
 
-    st = STORE.get_execution(execution_id)
     st.cancel_requested = True
     return jsonify({"execution_id": st.execution_id, "status": "cancelling"})
@@ -30,12 +30,13 @@ def apply() -> Any:
 
 @bp.get("/<dataset_id>/stats")
 def stats(dataset_id: str) -> Any:
-    if not STORE.has_dataset(dataset_id):
+    df = STORE.find_dataset(dataset_id)
+    if df is None:
         return jsonify({"error": "Dataset not found"}), 404
 
     columns = request.args.getlist("columns")
     try:
-        result = PreprocessingService.get_stats(dataset_id, columns=columns or None)
+        result = PreprocessingService.get_stats(df, columns=columns or None)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
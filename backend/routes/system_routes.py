@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any
+
+from flask import Blueprint, jsonify
+
+from services.storage import STORE
+from utils import startup
+
+
+bp = Blueprint("system", __name__, url_prefix="/api/system")
+
+
+@bp.get("/startup")
+def startup_info() -> Any:
+    return jsonify(startup.startup_report())
+
+
+@bp.get("/metrics")
+def metrics() -> Any:
+    return jsonify({"gc": STORE.gc_metrics()})
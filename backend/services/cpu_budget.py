@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# BLAS pools are process-wide, so one training cannot be given more BLAS threads
+# than another; they stay at one thread and the leases drive all parallelism.
+BLAS_THREADS = 1
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@dataclass
+class CpuLease:
+    threads: int
+    requested: Optional[int]
+    cpu_total: int
+    concurrent: int  # leases active when this one was granted, itself included
+    blas_threads: Optional[int] = None  # BLAS pool size in effect; None when no BLAS is loaded
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "threads": self.threads,
+            "requested": self.requested,
+            "cpu_total": self.cpu_total,
+            "concurrent_trainings": self.concurrent,
+            "blas_threads": self.blas_threads,
+        }
+
+
+class CpuBudget:
+    """Hands out thread counts to concurrent trainings so they share the cores.
+
+    Each training leases some threads (its own request, capped by what is still
+    free, never less than one) and uses that count for n_jobs and for the OpenMP
+    pool of the training thread. BLAS pools are process-wide rather than
+    per-thread and are not counted in the leases, so they are capped at
+    BLAS_THREADS; a BLAS library loaded after an earlier lease is capped when
+    the next lease is granted.
+
+    The budget is per process. With several gunicorn workers, set CPU_BUDGET to
+    each worker's share of the machine.
+    """
+
+    def __init__(self, total: Optional[int] = None) -> None:
+        self.total = max(1, total or int(os.environ.get("CPU_BUDGET", 0)) or _available_cpus())
+        self._lock = threading.Lock()
+        self._leases: List[CpuLease] = []
+
+    def resolve(self, n_jobs: Any) -> Optional[int]:
+        """Map an sklearn-style n_jobs to a thread count; None means the whole budget.
+
+        Negative values count back from the budget like joblib does from the CPU
+        count: -1 is every thread, -2 all but one, and so on (at least one).
+        """
+        if n_jobs in (None, "", 0):
+            return None
+        n = int(n_jobs)
+        if n == -1:
+            return None
+        return max(1, self.total + 1 + n) if n < 0 else n
+
+    def _grant(self, requested: Optional[int]) -> CpuLease:
+        with self._lock:
+            free = self.total - sum(lease.threads for lease in self._leases)
+            want = self.total if requested is None else max(1, int(requested))
+            lease = CpuLease(
+                threads=max(1, min(want, free)),
+                requested=requested,
+                cpu_total=self.total,
+                concurrent=len(self._leases) + 1,
+                blas_threads=self._cap_blas(),
+            )
+            self._leases.append(lease)
+            return lease
+
+    def _return(self, lease: CpuLease) -> None:
+        with self._lock:
+            self._leases.remove(lease)
+
+    def _cap_blas(self) -> Optional[int]:
+        # Called with self._lock held. Only pools above the cap are touched and the
+        # cap never changes, so running trainings never see their BLAS pool resized.
+        from threadpoolctl import threadpool_info, threadpool_limits
+
+        pools = [pool["num_threads"] for pool in threadpool_info() if pool["user_api"] == "blas"]
+        if any(n > BLAS_THREADS for n in pools):
+            threadpool_limits(limits=BLAS_THREADS, user_api="blas")
+        return BLAS_THREADS if pools else None
+
+    @contextlib.contextmanager
+    def lease(self, requested: Optional[int] = None) -> Iterator[CpuLease]:
+        """Lease up to ``requested`` threads (None: as many as are free)."""
+        from threadpoolctl import threadpool_limits
+
+        lease = self._grant(requested)
+        try:
+            # omp_set_num_threads applies to parallel regions started by this thread.
+            with threadpool_limits(limits=lease.threads, user_api="openmp"):
+                yield lease
+        finally:
+            self._return(lease)
+
+
+CPU_BUDGET = CpuBudget()
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
 import uuid
-from typing import Any, Dict, List, Tuple
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import numpy as np
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 from .storage import STORE
 
 
+SAMPLE_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+SAMPLE_EXTENSIONS = (".csv", ".xlsx", ".xls")
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Sample filename -> dataset id. Samples are parsed once and pinned in the store,
+# so every "load sample" click shares the same read-only frame.
+_sample_lock = threading.Lock()
+_sample_datasets: Dict[str, str] = {}
+
+
 class DataService:
     @staticmethod
     def _new_id(prefix: str) -> str:
@@ -16,6 +30,8 @@ class DataService:
 
     @staticmethod
     def load_dataframe_from_file(path: str) -> pd.DataFrame:
+        import pandas as pd
+
         lower = path.lower()
         if lower.endswith(".csv"):
             return pd.read_csv(path)
@@ -24,13 +40,76 @@ class DataService:
         raise ValueError("Unsupported file type")
 
     @staticmethod
-    def store_dataset(df: pd.DataFrame) -> str:
+    def save_and_hash(stream: IO[bytes], path: str) -> str:
+        """Copy ``stream`` to ``path`` in chunks, returning the SHA-256 of its content."""
+        digest = hashlib.sha256()
+        with open(path, "wb") as out:
+            while True:
+                chunk = stream.read(_HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def find_dataset_by_digest(digest: str) -> Optional[str]:
+        """Return the dataset already parsed from this content, adding a reference to it."""
+        return STORE.acquire_dataset_by_digest(digest)
+
+    @staticmethod
+    def store_dataset(df: pd.DataFrame, digest: Optional[str] = None, pinned: bool = False) -> str:
         dataset_id = DataService._new_id("ds")
-        STORE.put_dataset(dataset_id, df)
-        return dataset_id
+        return STORE.put_dataset(dataset_id, df, digest=digest, pinned=pinned)
+
+    @staticmethod
+    def list_sample_files() -> List[str]:
+        if not os.path.isdir(SAMPLE_DATA_DIR):
+            return []
+        return [
+            name
+            for name in sorted(os.listdir(SAMPLE_DATA_DIR))
+            if os.path.isfile(os.path.join(SAMPLE_DATA_DIR, name))
+            and name.lower().endswith(SAMPLE_EXTENSIONS)
+        ]
+
+    @staticmethod
+    def load_sample(filename: str) -> str:
+        """Return the dataset id for a bundled sample, parsing it on first use only.
+
+        ``filename`` must be a basename already validated to live in SAMPLE_DATA_DIR.
+        """
+        with _sample_lock:
+            dataset_id = _sample_datasets.get(filename)
+            if dataset_id is not None and STORE.has_dataset(dataset_id):
+                return dataset_id
+
+            path = os.path.join(SAMPLE_DATA_DIR, filename)
+            digest = DataService.hash_file(path)
+            df = DataService.load_dataframe_from_file(path)
+            dataset_id = DataService.store_dataset(df, digest=digest, pinned=True)
+            _sample_datasets[filename] = dataset_id
+            return dataset_id
+
+    @staticmethod
+    def preload_samples() -> int:
+        """Parse every bundled sample up front; returns how many were loaded."""
+        for filename in DataService.list_sample_files():
+            DataService.load_sample(filename)
+        return len(_sample_datasets)
 
     @staticmethod
     def get_dataset_info(dataset_id: str, preview_rows: int = 10) -> Dict[str, Any]:
+        import numpy as np
+
         df = STORE.get_dataset(dataset_id)
         preview_df = df.head(preview_rows)
 
@@ -48,8 +127,9 @@ class DataService:
         }
 
     @staticmethod
-    def get_preview(dataset_id: str, n_rows: int = 10) -> Tuple[List[Dict[str, Any]], List[str]]:
-        df = STORE.get_dataset(dataset_id)
+    def get_preview(df: pd.DataFrame, n_rows: int = 10) -> Tuple[List[Dict[str, Any]], List[str]]:
+        import numpy as np
+
         preview_df = df.head(n_rows)
         data = preview_df.replace({np.nan: None}).to_dict(orient="records")
         columns = list(preview_df.columns)
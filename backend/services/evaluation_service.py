@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+PROBA_BATCH_ROWS = 65_536
+DEFAULT_BOOTSTRAP_SAMPLES = 1000
+MAX_BOOTSTRAP_SAMPLES = 10_000
+CONFIDENCE_LEVEL = 0.95
+
+
+class EvaluationService:
+    """Classification metrics derived from a single confusion matrix.
+
+    Labels are integer-coded once and the confusion matrix is built with one
+    bincount; accuracy, weighted precision/recall/F1 and the per-class report
+    are all read off that matrix instead of re-scanning y_true/y_pred for each
+    metric. Bootstrap confidence intervals resample the confusion matrix cells
+    (a multinomial draw per replicate), which is equivalent to resampling test
+    rows but costs O(n_bootstrap * n_classes^2) regardless of test-set size.
+    """
+
+    @staticmethod
+    def predict(model: Any, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Return (y_pred, proba), with proba None when the model has no predict_proba.
+
+        Probabilities are computed in row batches, and predictions are taken as
+        their argmax so the test set is only pushed through the model once.
+        """
+        import numpy as np
+
+        if not hasattr(model, "predict_proba"):
+            return model.predict(X), None
+
+        n = X.shape[0]
+        if n <= PROBA_BATCH_ROWS:
+            proba = model.predict_proba(X)
+        else:
+            proba = np.empty((n, len(model.classes_)), dtype=np.float64)
+            for start in range(0, n, PROBA_BATCH_ROWS):
+                stop = min(start + PROBA_BATCH_ROWS, n)
+                proba[start:stop] = model.predict_proba(X[start:stop])
+
+        # Same rule the sklearn classifiers use in predict(): first class with the max score.
+        y_pred = model.classes_.take(np.argmax(proba, axis=1))
+        return y_pred, proba
+
+    @staticmethod
+    def confusion_matrix(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (labels, cm) with labels sorted like sklearn's unique_labels."""
+        import numpy as np
+
+        labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+        k = len(labels)
+        t = np.searchsorted(labels, y_true)
+        p = np.searchsorted(labels, y_pred)
+        cm = np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+        return labels, cm
+
+    @staticmethod
+    def _per_class(cm: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Precision, recall, F1 and support per class; works on (..., k, k) stacks.
+
+        Zero denominators yield 0, matching sklearn's zero_division=0.
+        """
+        import numpy as np
+
+        tp = np.diagonal(cm, axis1=-2, axis2=-1).astype(np.float64)
+        support = cm.sum(axis=-1).astype(np.float64)
+        predicted = cm.sum(axis=-2).astype(np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            # 2tp / (2tp + fp + fn), as sklearn computes it.
+            denom = support + predicted
+            f1 = np.where(denom > 0, 2 * tp / denom, 0.0)
+        return precision, recall, f1, support
+
+    @staticmethod
+    def _summary(cm: np.ndarray) -> Dict[str, np.ndarray]:
+        """Accuracy and support-weighted precision/recall/F1 for a (..., k, k) stack."""
+        import numpy as np
+
+        precision, recall, f1, support = EvaluationService._per_class(cm)
+        total = support.sum(axis=-1)
+        safe_total = np.where(total > 0, total, 1.0)
+        # sum(x * w) / sum(w), the same reduction order as np.average in sklearn.
+        return {
+            "accuracy": np.diagonal(cm, axis1=-2, axis2=-1).sum(axis=-1) / safe_total,
+            "precision": (precision * support).sum(axis=-1) / safe_total,
+            "recall": (recall * support).sum(axis=-1) / safe_total,
+            "f1": (f1 * support).sum(axis=-1) / safe_total,
+        }
+
+    @staticmethod
+    def classification_report(labels: np.ndarray, cm: np.ndarray) -> Dict[str, Any]:
+        """Same dict shape as sklearn's classification_report(output_dict=True)."""
+        precision, recall, f1, support = EvaluationService._per_class(cm)
+        summary = EvaluationService._summary(cm)
+        total = float(support.sum())
+
+        report: Dict[str, Any] = {}
+        for i, label in enumerate(labels):
+            report[str(label)] = {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1-score": float(f1[i]),
+                "support": float(support[i]),
+            }
+        report["accuracy"] = float(summary["accuracy"])
+        report["macro avg"] = {
+            "precision": float(precision.mean()),
+            "recall": float(recall.mean()),
+            "f1-score": float(f1.mean()),
+            "support": total,
+        }
+        report["weighted avg"] = {
+            "precision": float(summary["precision"]),
+            "recall": float(summary["recall"]),
+            "f1-score": float(summary["f1"]),
+            "support": total,
+        }
+        return report
+
+    @staticmethod
+    def _binary_auc(scores: np.ndarray, positive: np.ndarray) -> Optional[float]:
+        # Mann-Whitney U with average ranks for ties, identical to the trapezoidal ROC area.
+        from scipy.stats import rankdata
+
+        n_pos = int(positive.sum())
+        n_neg = positive.shape[0] - n_pos
+        if n_pos == 0 or n_neg == 0:
+            return None
+        ranks = rankdata(scores)
+        return float((ranks[positive].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+    @staticmethod
+    def probability_metrics(
+        y_true: np.ndarray, proba: np.ndarray, classes: np.ndarray
+    ) -> Dict[str, Optional[float]]:
+        """ROC-AUC (macro one-vs-rest for multiclass) and log-loss from predict_proba.
+
+        Either is None when undefined for this test set, e.g. a test label the
+        model never saw or a class with no positive or no negative samples.
+        """
+        import numpy as np
+
+        out: Dict[str, Optional[float]] = {"roc_auc": None, "log_loss": None}
+        idx = np.searchsorted(classes, y_true)
+        idx_clipped = np.minimum(idx, len(classes) - 1)
+        if len(classes) < 2 or not np.array_equal(classes[idx_clipped], np.asarray(y_true)):
+            return out
+
+        eps = np.finfo(proba.dtype).eps
+        p_true = np.clip(proba[np.arange(proba.shape[0]), idx], eps, 1 - eps)
+        out["log_loss"] = float(-np.log(p_true).mean())
+
+        if len(classes) == 2:
+            out["roc_auc"] = EvaluationService._binary_auc(proba[:, 1], idx == 1)
+        else:
+            aucs = [EvaluationService._binary_auc(proba[:, j], idx == j) for j in range(len(classes))]
+            if all(a is not None for a in aucs):
+                out["roc_auc"] = float(np.mean(aucs))
+        return out
+
+    @staticmethod
+    def bootstrap_intervals(
+        cm: np.ndarray,
+        n_bootstrap: int = DEFAULT_BOOTSTRAP_SAMPLES,
+        level: float = CONFIDENCE_LEVEL,
+        random_state: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Percentile bootstrap intervals for the confusion-matrix metrics.
+
+        ``n_bootstrap`` is clamped to [0, MAX_BOOTSTRAP_SAMPLES]; 0 skips the intervals.
+        """
+        import numpy as np
+
+        n_bootstrap = min(max(int(n_bootstrap), 0), MAX_BOOTSTRAP_SAMPLES)
+        n = int(cm.sum())
+        out: Dict[str, Any] = {"level": level, "n_bootstrap": n_bootstrap}
+        if n == 0 or n_bootstrap == 0:
+            return out
+
+        rng = np.random.default_rng(random_state)
+        k = cm.shape[0]
+        draws = rng.multinomial(n, cm.ravel() / n, size=n_bootstrap).reshape(n_bootstrap, k, k)
+        summary = EvaluationService._summary(draws)
+
+        alpha = (1.0 - level) / 2
+        for name, values in summary.items():
+            lo, hi = np.quantile(values, [alpha, 1.0 - alpha])
+            out[name] = [float(lo), float(hi)]
+        return out
+
+    @staticmethod
+    def evaluate(
+        model: Any,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+        n_bootstrap: int = DEFAULT_BOOTSTRAP_SAMPLES,
+        random_state: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        y_pred, proba = EvaluationService.predict(model, X_test)
+        labels, cm = EvaluationService.confusion_matrix(y_test, y_pred)
+        summary = EvaluationService._summary(cm)
+
+        metrics: Dict[str, Optional[float]] = {name: float(v) for name, v in summary.items()}
+        metrics.update({"roc_auc": None, "log_loss": None})
+        if proba is not None:
+            metrics.update(EvaluationService.probability_metrics(y_test, proba, model.classes_))
+
+        return {
+            "metrics": metrics,
+            "confusion_matrix": cm.tolist(),
+            "classification_report": EvaluationService.classification_report(labels, cm),
+            "confidence_intervals": EvaluationService.bootstrap_intervals(
+                cm, n_bootstrap=n_bootstrap, random_state=random_state
+            ),
+        }
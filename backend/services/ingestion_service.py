@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .data_service import DataService
+from .storage import STORE, IngestionJob
+
+
+CSV_CHUNK_ROWS = 50_000
+XLSX_PROGRESS_ROWS = 5_000
+
+
+class IngestionCancelled(Exception):
+    pass
+
+
+class IngestionService:
+    """Parses uploaded files in the background so the upload request returns at once.
+
+    Progress is published on the job's snapshot: CSV reports bytes and rows as
+    each chunk is parsed, xlsx reports rows as the read-only workbook streams,
+    and legacy .xls (no streaming reader) reports only completion.
+    """
+
+    @staticmethod
+    def _new_id(prefix: str) -> str:
+        return f"{prefix}_{uuid.uuid4().hex}"
+
+    @staticmethod
+    def start(path: str, file_name: str, digest: str) -> IngestionJob:
+        """Create a job for the spooled upload at ``path``; the job deletes it when done."""
+        job = IngestionJob(job_id=IngestionService._new_id("ing"), file_name=file_name)
+        bytes_total = os.path.getsize(path)
+        job.publish(bytes_total=bytes_total)
+        STORE.put_ingestion(job)
+
+        dataset_id = DataService.find_dataset_by_digest(digest)
+        if dataset_id is not None:
+            IngestionService._remove(path)
+            info = DataService.get_dataset_info(dataset_id)
+            job.publish(
+                status="success",
+                bytes_read=bytes_total,
+                rows_read=info["rows"],
+                rows_total=info["rows"],
+                dataset_id=dataset_id,
+                deduplicated=True,
+                info=info,
+            )
+            return job
+
+        threading.Thread(target=IngestionService._run, args=(job, path, digest), daemon=True).start()
+        return job
+
+    @staticmethod
+    def _run(job: IngestionJob, path: str, digest: str) -> None:
+        job.publish(status="running")
+        try:
+            df = IngestionService.read_dataframe(job, path)
+            dataset_id = DataService.store_dataset(df, digest=digest)
+            job.publish(
+                status="success",
+                bytes_read=job.snapshot.bytes_total,
+                rows_read=int(df.shape[0]),
+                rows_total=int(df.shape[0]),
+                dataset_id=dataset_id,
+                info=DataService.get_dataset_info(dataset_id),
+            )
+        except IngestionCancelled:
+            job.publish(status="cancelled", message="Upload cancelled")
+        except Exception as e:
+            job.publish(status="error", message=f"Failed to parse file: {e}")
+        finally:
+            IngestionService._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _check_cancel(job: IngestionJob) -> None:
+        if job.cancel_requested:
+            raise IngestionCancelled()
+
+    @staticmethod
+    def read_dataframe(job: IngestionJob, path: str) -> pd.DataFrame:
+        lower = path.lower()
+        if lower.endswith(".csv"):
+            return IngestionService._read_csv(job, path)
+        if lower.endswith(".xlsx"):
+            return IngestionService._read_xlsx(job, path)
+        return DataService.load_dataframe_from_file(path)
+
+    @staticmethod
+    def _read_csv(job: IngestionJob, path: str) -> pd.DataFrame:
+        import pandas as pd
+
+        chunks: List[pd.DataFrame] = []
+        rows = 0
+        with open(path, "rb") as f:
+            for chunk in pd.read_csv(f, chunksize=CSV_CHUNK_ROWS):
+                IngestionService._check_cancel(job)
+                chunks.append(chunk)
+                rows += int(chunk.shape[0])
+                job.publish(bytes_read=f.tell(), rows_read=rows)
+
+        if not chunks:
+            # Header-only file: let the regular reader produce the empty frame.
+            return pd.read_csv(path)
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat(chunks, ignore_index=True)
+
+    @staticmethod
+    def _read_xlsx(job: IngestionJob, path: str) -> pd.DataFrame:
+        import pandas as pd
+        from openpyxl import load_workbook
+        from pandas.io.parsers import TextParser
+
+        # read_only streams rows from the sheet XML instead of building the whole
+        # cell tree; data_only returns cached formula results like read_excel does.
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            if ws.max_row:
+                job.publish(rows_total=max(ws.max_row - 1, 0))
+            # The stored dimensions can be wrong; read every row like read_excel.
+            ws.reset_dimensions()
+
+            data: List[List[Any]] = []
+            last_row_with_data = -1
+            for row_number, row in enumerate(ws.rows):
+                converted = [IngestionService._convert_cell(cell) for cell in row]
+                while converted and converted[-1] == "":
+                    converted.pop()
+                if converted:
+                    last_row_with_data = row_number
+                data.append(converted)
+                if row_number and row_number % XLSX_PROGRESS_ROWS == 0:
+                    IngestionService._check_cancel(job)
+                    job.publish(rows_read=row_number)
+        finally:
+            wb.close()
+
+        # Same shaping as pandas' openpyxl reader: drop trailing blank rows, pad
+        # rows to the widest one, then let TextParser infer types and name columns.
+        data = data[: last_row_with_data + 1]
+        if not data:
+            return pd.DataFrame()
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+
+    @staticmethod
+    def _convert_cell(cell: Any) -> Any:
+        # Mirrors pandas' openpyxl reader: blanks are "", errors NaN, integral numbers int.
+        from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+        if cell.value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return float("nan")
+        if cell.data_type == TYPE_NUMERIC:
+            value = int(cell.value)
+            return value if value == cell.value else float(cell.value)
+        return cell.value
@@ -1,22 +1,21 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Dict, List, Optional, Tuple
-
-import numpy as np
-import pandas as pd
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    precision_recall_fscore_support,
-)
-from sklearn.tree import DecisionTreeClassifier
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+from .cpu_budget import CPU_BUDGET
+from .evaluation_service import DEFAULT_BOOTSTRAP_SAMPLES, EvaluationService
 from .storage import STORE
 
 
+# Model types that train on more than one core; the rest lease a single thread.
+PARALLEL_MODEL_TYPES = {"random_forest", "hist_gradient_boosting"}
+
+
 class ModelService:
     @staticmethod
     def _new_id(prefix: str) -> str:
@@ -28,6 +27,8 @@ class ModelService:
         target_column: str,
         feature_columns: List[str],
     ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        import pandas as pd
+
         if target_column not in df.columns:
             raise ValueError(f"Target column '{target_column}' not found")
 
@@ -55,38 +56,39 @@ class ModelService:
         target_column: str,
         feature_columns: List[str],
         hyperparameters: Optional[Dict[str, Any]] = None,
+        max_threads: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """Fit and evaluate a classifier.
+
+        ``max_threads`` is the caller's CPU budget (e.g. a pipeline execution's);
+        a ``n_jobs`` hyperparameter can lower it further. The threads actually
+        granted depend on what other trainings hold and are reported under
+        ``cpu_allocation``.
+        """
         hyperparameters = hyperparameters or {}
+        if model_type not in PARALLEL_MODEL_TYPES | {"logistic_regression", "decision_tree"}:
+            raise ValueError("Unsupported model_type")
 
         X_train, y_train, feature_names = ModelService._prepare_xy(
             train_df, target_column, feature_columns
         )
         X_test, y_test, _ = ModelService._prepare_xy(test_df, target_column, feature_columns)
 
-        if model_type == "logistic_regression":
-            max_iter = int(hyperparameters.get("max_iter", 200))
-            C = float(hyperparameters.get("C", 1.0))
-            model = LogisticRegression(max_iter=max_iter, C=C)
-        elif model_type == "decision_tree":
-            max_depth = hyperparameters.get("max_depth", None)
-            min_samples_split = int(hyperparameters.get("min_samples_split", 2))
-            model = DecisionTreeClassifier(
-                max_depth=None if max_depth in (None, "", 0) else int(max_depth),
-                min_samples_split=min_samples_split,
+        requested: Optional[int] = 1
+        if model_type in PARALLEL_MODEL_TYPES:
+            limits = [CPU_BUDGET.resolve(v) for v in (hyperparameters.get("n_jobs"), max_threads)]
+            requested = min((v for v in limits if v is not None), default=None)
+
+        with CPU_BUDGET.lease(requested) as lease:
+            model = ModelService._build_model(model_type, hyperparameters, lease.threads)
+            model.fit(X_train, y_train)
+            evaluation = EvaluationService.evaluate(
+                model,
+                X_test,
+                y_test,
+                n_bootstrap=int(hyperparameters.get("n_bootstrap", DEFAULT_BOOTSTRAP_SAMPLES)),
                 random_state=int(hyperparameters.get("random_state", 42)),
             )
-        else:
-            raise ValueError("Unsupported model_type")
-
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-
-        accuracy = float(accuracy_score(y_test, y_pred))
-        precision, recall, f1, _ = precision_recall_fscore_support(
-            y_test, y_pred, average="weighted", zero_division=0
-        )
-        cm = confusion_matrix(y_test, y_pred)
-        report = classification_report(y_test, y_pred, output_dict=True, zero_division=0)
 
         model_id = ModelService._new_id("model")
         STORE.put_model(model_id, {"model": model, "feature_names": feature_names, "type": model_type})
@@ -94,17 +96,11 @@ class ModelService:
         payload: Dict[str, Any] = {
             "model_id": model_id,
             "status": "success",
-            "metrics": {
-                "accuracy": accuracy,
-                "precision": float(precision),
-                "recall": float(recall),
-                "f1": float(f1),
-            },
-            "confusion_matrix": cm.tolist(),
-            "classification_report": report,
+            **evaluation,
+            "cpu_allocation": lease.to_dict(),
         }
 
-        if model_type == "decision_tree":
+        if model_type in ("decision_tree", "random_forest"):
             importances = getattr(model, "feature_importances_", None)
             if importances is not None:
                 payload["feature_importance"] = {
@@ -113,3 +109,46 @@ class ModelService:
                 }
 
         return payload
+
+    @staticmethod
+    def _build_model(model_type: str, hyperparameters: Dict[str, Any], n_threads: int) -> Any:
+        # sklearn is imported on first use so worker boot does not pay for it
+        # (see utils.startup for the preload mode that imports it in the master).
+        from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.tree import DecisionTreeClassifier
+
+        max_depth = hyperparameters.get("max_depth", None)
+        max_depth = None if max_depth in (None, "", 0) else int(max_depth)
+        random_state = int(hyperparameters.get("random_state", 42))
+
+        if model_type == "logistic_regression":
+            max_iter = int(hyperparameters.get("max_iter", 200))
+            C = float(hyperparameters.get("C", 1.0))
+            model = LogisticRegression(max_iter=max_iter, C=C)
+        elif model_type == "decision_tree":
+            min_samples_split = int(hyperparameters.get("min_samples_split", 2))
+            model = DecisionTreeClassifier(
+                max_depth=max_depth,
+                min_samples_split=min_samples_split,
+                random_state=random_state,
+            )
+        elif model_type == "random_forest":
+            model = RandomForestClassifier(
+                n_estimators=int(hyperparameters.get("n_estimators", 100)),
+                max_depth=max_depth,
+                min_samples_split=int(hyperparameters.get("min_samples_split", 2)),
+                random_state=random_state,
+                n_jobs=n_threads,
+            )
+        elif model_type == "hist_gradient_boosting":
+            # Parallelised with OpenMP; the lease caps the pool for this thread.
+            model = HistGradientBoostingClassifier(
+                max_iter=int(hyperparameters.get("max_iter", 100)),
+                learning_rate=float(hyperparameters.get("learning_rate", 0.1)),
+                max_depth=max_depth,
+                random_state=random_state,
+            )
+        else:
+            raise ValueError("Unsupported model_type")
+        return model
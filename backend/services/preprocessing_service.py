@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import numpy as np
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+if TYPE_CHECKING:
+    import pandas as pd
 
 from .storage import STORE
 
@@ -17,11 +16,14 @@ class PreprocessingService:
 
     @staticmethod
     def _numeric_columns(df: pd.DataFrame) -> List[str]:
+        import pandas as pd
+
         return [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
 
     @staticmethod
-    def get_stats(dataset_id: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
-        df = STORE.get_dataset(dataset_id)
+    def get_stats(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        import numpy as np
+
         cols = columns or PreprocessingService._numeric_columns(df)
         numeric = df[cols].select_dtypes(include=["number"])
         desc = numeric.describe().replace({np.nan: None}).to_dict()
@@ -29,8 +31,14 @@ class PreprocessingService:
 
     @staticmethod
     def apply(dataset_id: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
-        df = STORE.get_dataset(dataset_id).copy()
-        before = PreprocessingService.get_stats(dataset_id)
+        import pandas as pd
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+        source = STORE.find_dataset(dataset_id)
+        if source is None:
+            raise ValueError("Dataset not found")
+        df = source.copy()
+        before = PreprocessingService.get_stats(source)
 
         for op in operations:
             op_type = op.get("type")
@@ -52,7 +60,7 @@ class PreprocessingService:
 
         processed_id = PreprocessingService._new_id("ds")
         STORE.put_dataset(processed_id, df)
-        after = PreprocessingService.get_stats(processed_id)
+        after = PreprocessingService.get_stats(df)
 
         return {
             "processed_dataset_id": processed_id,
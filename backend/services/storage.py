@@ -1,64 +1,419 @@
 from __future__ import annotations
 
+import os
 import threading
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Set
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Finished executions are compacted (bulky node results trimmed, owned datasets
+# and models released) after EXECUTION_COMPACT_AFTER_SECONDS, and dropped entirely after
+# EXECUTION_TTL_SECONDS. The UI stops polling as soon as a run finishes.
+EXECUTION_COMPACT_AFTER_SECONDS = float(os.environ.get("EXECUTION_COMPACT_AFTER_SECONDS", "60"))
+EXECUTION_TTL_SECONDS = float(os.environ.get("EXECUTION_TTL_SECONDS", "900"))
+INGESTION_TTL_SECONDS = float(os.environ.get("INGESTION_TTL_SECONDS", "900"))
+SWEEP_INTERVAL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class ExecutionSnapshot:
+    """Immutable view of an execution at one point in time.
+
+    Snapshots are never mutated after they are built, so readers can use one
+    without a lock and always see a status consistent with its node statuses.
+    """
+
+    execution_id: str
+    status: str = "queued"  # queued|running|success|error|cancelled
+    message: str = ""
+    node_status: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))  # node_id -> status
+    results_per_node: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    compacted: bool = False
+    version: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "execution_id": self.execution_id,
+            "status": self.status,
+            "message": self.message,
+            "node_status": dict(self.node_status),
+            "results_per_node": dict(self.results_per_node),
+            "compacted": self.compacted,
+            "version": self.version,
+        }
 
 
 @dataclass
 class ExecutionState:
     execution_id: str
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    # One store reference per entry, released when the execution is compacted.
+    owned_datasets: List[str] = field(default_factory=list)
+    # Models trained by this execution, deleted when it is compacted.
+    owned_models: List[str] = field(default_factory=list)
+    _snapshot: ExecutionSnapshot = field(init=False, repr=False)
+    _publish_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._snapshot = ExecutionSnapshot(execution_id=self.execution_id)
+
+    @property
+    def snapshot(self) -> ExecutionSnapshot:
+        # A single attribute read: readers never wait on the writer.
+        return self._snapshot
+
+    @property
+    def status(self) -> str:
+        return self._snapshot.status
+
+    def publish(
+        self,
+        status: Optional[str] = None,
+        message: Optional[str] = None,
+        node_status: Optional[Dict[str, str]] = None,
+        results: Optional[Dict[str, Any]] = None,
+        compacted: Optional[bool] = None,
+    ) -> ExecutionSnapshot:
+        """Apply a set of changes and publish them as one new snapshot.
+
+        ``node_status`` and ``results`` are merged into the previous snapshot's
+        mappings. Everything passed in a single call becomes visible at once.
+        """
+        with self._publish_lock:
+            prev = self._snapshot
+            changes: Dict[str, Any] = {"version": prev.version + 1}
+            if status is not None:
+                changes["status"] = status
+            if message is not None:
+                changes["message"] = message
+            if node_status:
+                changes["node_status"] = MappingProxyType({**prev.node_status, **node_status})
+            if results:
+                changes["results_per_node"] = MappingProxyType({**prev.results_per_node, **results})
+            if compacted is not None:
+                changes["compacted"] = compacted
+            self._snapshot = replace(prev, **changes)
+            return self._snapshot
+
+
+@dataclass(frozen=True)
+class IngestionSnapshot:
+    job_id: str
+    file_name: str
     status: str = "queued"  # queued|running|success|error|cancelled
     message: str = ""
-    results_per_node: Dict[str, Any] = field(default_factory=dict)
-    node_status: Dict[str, str] = field(default_factory=dict)  # node_id -> status
+    bytes_total: int = 0
+    bytes_read: int = 0
+    rows_read: int = 0
+    rows_total: Optional[int] = None
+    dataset_id: Optional[str] = None
+    deduplicated: bool = False
+    info: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "file_name": self.file_name,
+            "status": self.status,
+            "message": self.message,
+            "progress": {
+                "bytes_total": self.bytes_total,
+                "bytes_read": self.bytes_read,
+                "rows_read": self.rows_read,
+                "rows_total": self.rows_total,
+            },
+            "dataset_id": self.dataset_id,
+            "deduplicated": self.deduplicated,
+            "info": self.info,
+        }
+
+
+@dataclass
+class IngestionJob:
+    """A background upload parse. Published the same way as ExecutionState."""
+
+    job_id: str
+    file_name: str
     cancel_requested: bool = False
+    finished_at: Optional[float] = None
+    _snapshot: IngestionSnapshot = field(init=False, repr=False)
+    _publish_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._snapshot = IngestionSnapshot(job_id=self.job_id, file_name=self.file_name)
+
+    @property
+    def snapshot(self) -> IngestionSnapshot:
+        return self._snapshot
+
+    def publish(self, **changes: Any) -> IngestionSnapshot:
+        with self._publish_lock:
+            self._snapshot = replace(self._snapshot, **changes)
+            if self._snapshot.status in ("success", "error", "cancelled") and self.finished_at is None:
+                self.finished_at = time.time()
+            return self._snapshot
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
 
 
 class InMemoryStore:
+    """Process-local store for datasets, models and executions.
+
+    Each collection has its own lock, taken only by writers and by operations
+    that must read-modify-write (reference counts). Plain lookups are single dict
+    operations, which are atomic under the GIL, so readers never take a lock and
+    never wait behind an upload, a release or another collection's writers.
+    """
+
     def __init__(self) -> None:
-        self._lock = threading.Lock()
+        self._datasets_lock = threading.Lock()
+        self._models_lock = threading.Lock()
+        self._executions_lock = threading.Lock()
+        self._ingestions_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
         self._datasets: Dict[str, pd.DataFrame] = {}
+        self._dataset_refs: Dict[str, int] = {}
+        # The part of _dataset_refs held by pipeline executions rather than clients.
+        self._dataset_holds: Dict[str, int] = {}
+        self._pinned_datasets: Set[str] = set()
+        self._digest_to_dataset: Dict[str, str] = {}
+        self._dataset_to_digest: Dict[str, str] = {}
         self._models: Dict[str, Any] = {}
         self._executions: Dict[str, ExecutionState] = {}
+        self._ingestions: Dict[str, IngestionJob] = {}
+        self._last_sweep = 0.0
+        self._gc_metrics: Dict[str, int] = {
+            "datasets_freed": 0,
+            "dataset_bytes_reclaimed": 0,
+            "models_freed": 0,
+            "executions_compacted": 0,
+            "executions_expired": 0,
+            "result_bytes_reclaimed": 0,
+        }
+
+    def put_dataset(
+        self,
+        dataset_id: str,
+        df: pd.DataFrame,
+        digest: Optional[str] = None,
+        pinned: bool = False,
+    ) -> str:
+        """Store ``df`` with one reference and return the id it is stored under.
+
+        When ``digest`` (a content hash of the source bytes) is already known, the
+        existing dataset gains a reference and its id is returned instead, so two
+        concurrent uploads of the same file still end up sharing one frame.
+        Pinned datasets (the bundled samples) start without a reference and are
+        never freed, though uploads of the same content still count theirs.
+        Pinning content that was already uploaded pins the existing dataset.
+        """
+        with self._datasets_lock:
+            if digest is not None and digest in self._digest_to_dataset:
+                existing_id = self._digest_to_dataset[digest]
+                if pinned:
+                    self._pinned_datasets.add(existing_id)
+                else:
+                    self._dataset_refs[existing_id] += 1
+                return existing_id
 
-    def put_dataset(self, dataset_id: str, df: pd.DataFrame) -> None:
-        with self._lock:
             self._datasets[dataset_id] = df
+            self._dataset_refs[dataset_id] = 0 if pinned else 1
+            self._dataset_holds[dataset_id] = 0
+            if pinned:
+                self._pinned_datasets.add(dataset_id)
+            if digest is not None:
+                self._digest_to_dataset[digest] = dataset_id
+                self._dataset_to_digest[dataset_id] = digest
+            return dataset_id
+
+    def acquire_dataset_by_digest(self, digest: str) -> Optional[str]:
+        """Add a reference to the dataset parsed from content ``digest``, if any."""
+        with self._datasets_lock:
+            dataset_id = self._digest_to_dataset.get(digest)
+            if dataset_id is not None:
+                self._dataset_refs[dataset_id] += 1
+            return dataset_id
+
+    def hold_dataset(self, dataset_id: str) -> bool:
+        """Add an execution-held reference to ``dataset_id``; False if it does not exist."""
+        with self._datasets_lock:
+            if dataset_id not in self._datasets:
+                return False
+            self._dataset_refs[dataset_id] += 1
+            self._dataset_holds[dataset_id] += 1
+            return True
+
+    def adopt_dataset(self, dataset_id: str) -> None:
+        """Turn the reference a dataset was created with into an execution-held one."""
+        with self._datasets_lock:
+            if dataset_id in self._datasets:
+                self._dataset_holds[dataset_id] += 1
+
+    def client_refcount(self, dataset_id: str) -> int:
+        """References a client can still drop via DELETE."""
+        return self._dataset_refs.get(dataset_id, 0) - self._dataset_holds.get(dataset_id, 0)
+
+    def release_dataset(self, dataset_id: str, held: bool = False) -> bool:
+        """Drop one reference; returns True if the dataset was freed.
+
+        ``held`` releases an execution-held reference. Client releases never take
+        the count below what executions hold, so a client cannot free a dataset
+        out from under a running pipeline. Pinned datasets are never freed.
+        """
+        with self._datasets_lock:
+            if dataset_id not in self._datasets:
+                return False
+            if held:
+                self._dataset_holds[dataset_id] -= 1
+            elif self._dataset_refs[dataset_id] <= self._dataset_holds[dataset_id]:
+                return False
+            self._dataset_refs[dataset_id] -= 1
+            if self._dataset_refs[dataset_id] > 0 or dataset_id in self._pinned_datasets:
+                return False
+
+            df = self._datasets.pop(dataset_id)
+            del self._dataset_refs[dataset_id]
+            del self._dataset_holds[dataset_id]
+            digest = self._dataset_to_digest.pop(dataset_id, None)
+            if digest is not None:
+                del self._digest_to_dataset[digest]
+
+        # Sizing object columns walks every value, so do it outside the lock.
+        nbytes = _frame_nbytes(df)
+        with self._metrics_lock:
+            self._gc_metrics["datasets_freed"] += 1
+            self._gc_metrics["dataset_bytes_reclaimed"] += nbytes
+        return True
 
     def get_dataset(self, dataset_id: str) -> pd.DataFrame:
-        with self._lock:
-            return self._datasets[dataset_id]
+        return self._datasets[dataset_id]
+
+    def find_dataset(self, dataset_id: str) -> Optional[pd.DataFrame]:
+        # Datasets can be freed at any time (DELETE, execution sweeps), so callers
+        # that do not hold a reference look up once instead of has_ then get_.
+        return self._datasets.get(dataset_id)
 
     def has_dataset(self, dataset_id: str) -> bool:
-        with self._lock:
-            return dataset_id in self._datasets
+        return dataset_id in self._datasets
 
     def put_model(self, model_id: str, model: Any) -> None:
-        with self._lock:
+        with self._models_lock:
             self._models[model_id] = model
 
     def has_model(self, model_id: str) -> bool:
-        with self._lock:
-            return model_id in self._models
+        return model_id in self._models
 
     def get_model(self, model_id: str) -> Any:
-        with self._lock:
-            return self._models[model_id]
+        return self._models[model_id]
+
+    def delete_model(self, model_id: str) -> bool:
+        with self._models_lock:
+            return self._models.pop(model_id, None) is not None
 
     def put_execution(self, state: ExecutionState) -> None:
-        with self._lock:
+        with self._executions_lock:
             self._executions[state.execution_id] = state
 
     def get_execution(self, execution_id: str) -> ExecutionState:
-        with self._lock:
-            return self._executions[execution_id]
+        return self._executions[execution_id]
+
+    def find_execution(self, execution_id: str) -> Optional[ExecutionState]:
+        return self._executions.get(execution_id)
 
     def has_execution(self, execution_id: str) -> bool:
-        with self._lock:
-            return execution_id in self._executions
+        return execution_id in self._executions
+
+    def put_ingestion(self, job: IngestionJob) -> None:
+        with self._ingestions_lock:
+            self._ingestions[job.job_id] = job
+
+    def find_ingestion(self, job_id: str) -> Optional[IngestionJob]:
+        return self._ingestions.get(job_id)
+
+    def sweep_ingestions(self, now: Optional[float] = None) -> None:
+        """Drop ingestion jobs that finished more than INGESTION_TTL_SECONDS ago.
+
+        The parsed dataset lives on in the dataset collection; only the job record goes.
+        """
+        now = time.time() if now is None else now
+        with self._ingestions_lock:
+            for job_id, job in list(self._ingestions.items()):
+                if job.finished_at is not None and now - job.finished_at >= INGESTION_TTL_SECONDS:
+                    del self._ingestions[job_id]
+
+    def sweep_executions(
+        self,
+        compact: Callable[[ExecutionState], int],
+        now: Optional[float] = None,
+        force: bool = False,
+    ) -> None:
+        """Compact and expire finished executions.
+
+        ``compact`` publishes a trimmed snapshot of an execution's node results
+        and returns the number of bytes it saved. Sweeps are rate-limited to one per
+        SWEEP_INTERVAL_SECONDS unless ``force`` is set, so callers can invoke this
+        from hot request paths. Running executions are never touched.
+        """
+        now = time.time() if now is None else now
+        to_compact: List[ExecutionState] = []
+        expired: List[ExecutionState] = []
+
+        with self._executions_lock:
+            if not force and now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+                return
+            self._last_sweep = now
+
+            for execution_id, st in list(self._executions.items()):
+                if st.finished_at is None:
+                    continue
+                age = now - st.finished_at
+                if age >= EXECUTION_TTL_SECONDS:
+                    del self._executions[execution_id]
+                    expired.append(st)
+                elif age >= EXECUTION_COMPACT_AFTER_SECONDS and not st.snapshot.compacted:
+                    # Claimed here, under the lock, so overlapping sweeps compact once.
+                    st.publish(compacted=True)
+                    to_compact.append(st)
+
+        saved = 0
+        models_freed = 0
+        for st in to_compact:
+            saved += compact(st)
+        for st in to_compact + expired:
+            owned, st.owned_datasets = st.owned_datasets, []
+            for dataset_id in owned:
+                self.release_dataset(dataset_id, held=True)
+            owned, st.owned_models = st.owned_models, []
+            for model_id in owned:
+                models_freed += self.delete_model(model_id)
+
+        with self._metrics_lock:
+            self._gc_metrics["models_freed"] += models_freed
+            self._gc_metrics["executions_compacted"] += len(to_compact)
+            self._gc_metrics["executions_expired"] += len(expired)
+            self._gc_metrics["result_bytes_reclaimed"] += saved
+
+    def gc_metrics(self) -> Dict[str, int]:
+        with self._metrics_lock:
+            return {
+                **self._gc_metrics,
+                "datasets": len(self._datasets),
+                "executions": len(self._executions),
+                "ingestions": len(self._ingestions),
+                "models": len(self._models),
+            }
 
 
 STORE = InMemoryStore()
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# The backend is run from its own directory (python app.py, gunicorn app:app), so
+# its packages are imported top-level; make that work from any pytest invocation.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client():
+    from app import create_app
+
+    return create_app().test_client()
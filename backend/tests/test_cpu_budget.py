@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy  # noqa: F401  (loads the BLAS pools the budget caps)
+import pytest
+from threadpoolctl import threadpool_info
+
+from services.cpu_budget import BLAS_THREADS, CpuBudget
+
+
+@pytest.mark.parametrize(
+    "n_jobs, expected",
+    [(None, None), ("", None), (0, None), (-1, None), (-2, 7), (-8, 1), (-20, 1), (3, 3), ("4", 4)],
+)
+def test_resolve_maps_n_jobs_like_sklearn(n_jobs: object, expected: object) -> None:
+    assert CpuBudget(total=8).resolve(n_jobs) == expected
+
+
+def test_grant_is_capped_by_budget_and_free_threads() -> None:
+    budget = CpuBudget(total=8)
+    first = budget._grant(None)
+    assert first.threads == 8
+    assert first.concurrent == 1
+
+    # Nothing is free, but a training always gets at least one thread.
+    second = budget._grant(2)
+    assert second.threads == 1
+    assert second.concurrent == 2
+
+    budget._return(first)
+    third = budget._grant(100)
+    assert third.threads == 7
+    budget._return(second)
+    budget._return(third)
+
+
+def test_concurrent_leases_share_the_budget() -> None:
+    budget = CpuBudget(total=8)
+    with budget.lease(5) as a:
+        with budget.lease(5) as b:
+            assert (a.threads, b.threads) == (5, 3)
+            assert b.to_dict()["concurrent_trainings"] == 2
+        with budget.lease(None) as c:
+            assert c.threads == 3
+    with budget.lease(None) as d:
+        assert d.threads == 8
+
+
+def test_blas_pools_are_capped_and_reported() -> None:
+    with CpuBudget(total=8).lease(1) as lease:
+        pools = [pool["num_threads"] for pool in threadpool_info() if pool["user_api"] == "blas"]
+        assert all(n <= BLAS_THREADS for n in pools)
+        assert lease.to_dict()["blas_threads"] == (BLAS_THREADS if pools else None)
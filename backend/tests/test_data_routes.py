@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import io
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from routes import data_routes
+from services import data_service
+from services.data_service import DataService
+from services.storage import STORE
+
+
+def _csv_bytes() -> bytes:
+    # Unique content per test so dedup never matches another test's upload.
+    return f"a,b\n1,{uuid.uuid4().hex}\n2,x\n".encode()
+
+
+def _upload(client: Any, content: bytes, name: str = "data.csv") -> Dict[str, Any]:
+    resp = client.post("/api/data/upload", data={"file": (io.BytesIO(content), name)})
+    body = resp.get_json()
+    deadline = time.time() + 10
+    while body["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+        body = client.get(f"/api/data/ingestions/{body['job_id']}").get_json()
+    assert body["status"] == "success", body
+    return body
+
+
+@pytest.fixture
+def sample_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(data_service, "SAMPLE_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data_routes, "SAMPLE_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data_service, "_sample_datasets", {})
+    return tmp_path
+
+
+def test_duplicate_upload_returns_same_dataset_and_adds_reference(client: Any) -> None:
+    content = _csv_bytes()
+    first = _upload(client, content)
+    second = _upload(client, content, name="copy.csv")
+
+    assert second["dataset_id"] == first["dataset_id"]
+    assert second["deduplicated"] is True
+    assert STORE.client_refcount(first["dataset_id"]) == 2
+
+
+def test_delete_drops_one_reference_and_frees_on_last(client: Any) -> None:
+    content = _csv_bytes()
+    dataset_id = _upload(client, content)["dataset_id"]
+    _upload(client, content)
+
+    resp = client.delete(f"/api/data/{dataset_id}")
+    assert resp.status_code == 200
+    assert resp.get_json()["freed"] is False
+    assert STORE.has_dataset(dataset_id)
+
+    resp = client.delete(f"/api/data/{dataset_id}")
+    assert resp.get_json()["freed"] is True
+    assert not STORE.has_dataset(dataset_id)
+    assert client.delete(f"/api/data/{dataset_id}").status_code == 404
+
+    # The digest went with the frame, so the same bytes are parsed afresh.
+    again = _upload(client, content)
+    assert again["dataset_id"] != dataset_id
+    assert not again.get("deduplicated")
+
+
+def test_upload_then_load_sample_keeps_upload_reference_releasable(client: Any, sample_dir: Path) -> None:
+    content = _csv_bytes()
+    (sample_dir / "sample.csv").write_bytes(content)
+    dataset_id = _upload(client, content)["dataset_id"]
+
+    resp = client.post("/api/data/samples/load", json={"filename": "sample.csv"})
+    assert resp.get_json()["dataset_id"] == dataset_id
+
+    # The upload's reference can still be dropped, but the now pinned frame stays.
+    resp = client.delete(f"/api/data/{dataset_id}")
+    assert resp.status_code == 200
+    assert resp.get_json()["freed"] is False
+    assert STORE.has_dataset(dataset_id)
+    assert client.delete(f"/api/data/{dataset_id}").status_code == 409
+
+
+def test_load_sample_parses_once(sample_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (sample_dir / "sample.csv").write_bytes(_csv_bytes())
+    parsed: List[str] = []
+    load = DataService.load_dataframe_from_file
+
+    def counting_load(path: str) -> Any:
+        parsed.append(path)
+        return load(path)
+
+    monkeypatch.setattr(DataService, "load_dataframe_from_file", staticmethod(counting_load))
+
+    first = DataService.load_sample("sample.csv")
+    second = DataService.load_sample("sample.csv")
+    assert first == second
+    assert len(parsed) == 1
+    assert STORE.client_refcount(first) == 0
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    log_loss,
+    precision_recall_fscore_support,
+    roc_auc_score,
+)
+from sklearn.tree import DecisionTreeClassifier
+
+from services.evaluation_service import MAX_BOOTSTRAP_SAMPLES, EvaluationService
+
+
+def _dataset(n_classes: int, labels: Optional[np.ndarray] = None):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 5))
+    y = (X[:, 0] * 2 + rng.normal(size=3000)).round().clip(0, n_classes - 1).astype(int)
+    if labels is not None:
+        y = labels[y]
+    return X[:2000], y[:2000], X[2000:], y[2000:]
+
+
+@pytest.mark.parametrize(
+    "n_classes, labels",
+    [
+        (2, None),
+        (3, None),
+        (4, np.array(["a", "b", "c", "d"], dtype=object)),
+    ],
+    ids=["binary", "multiclass", "string-labels"],
+)
+@pytest.mark.parametrize(
+    "make_model",
+    [lambda: LogisticRegression(max_iter=500), lambda: DecisionTreeClassifier(max_depth=4, random_state=0)],
+    ids=["logistic_regression", "decision_tree"],
+)
+def test_matches_sklearn_metrics(
+    n_classes: int, labels: Optional[np.ndarray], make_model: Callable[[], Any]
+) -> None:
+    X_train, y_train, X_test, y_test = _dataset(n_classes, labels)
+    model = make_model().fit(X_train, y_train)
+    result = EvaluationService.evaluate(model, X_test, y_test, random_state=0)
+    metrics = result["metrics"]
+
+    y_pred = model.predict(X_test)
+    proba = model.predict_proba(X_test)
+    precision, recall, f1, _ = precision_recall_fscore_support(y_test, y_pred, average="weighted", zero_division=0)
+    if n_classes == 2:
+        roc_auc = roc_auc_score(y_test, proba[:, 1])
+    else:
+        roc_auc = roc_auc_score(y_test, proba, multi_class="ovr")
+
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(y_test, y_pred), abs=1e-12)
+    assert metrics["precision"] == pytest.approx(precision, abs=1e-12)
+    assert metrics["recall"] == pytest.approx(recall, abs=1e-12)
+    assert metrics["f1"] == pytest.approx(f1, abs=1e-12)
+    assert metrics["roc_auc"] == pytest.approx(roc_auc, abs=1e-12)
+    assert metrics["log_loss"] == pytest.approx(log_loss(y_test, proba, labels=model.classes_), abs=1e-12)
+    assert result["confusion_matrix"] == confusion_matrix(y_test, y_pred).tolist()
+    assert result["classification_report"] == classification_report(
+        y_test, y_pred, output_dict=True, zero_division=0
+    )
+
+    lo, hi = result["confidence_intervals"]["accuracy"]
+    assert lo <= metrics["accuracy"] <= hi
+
+
+def test_unseen_test_label_leaves_probability_metrics_undefined() -> None:
+    model = DecisionTreeClassifier().fit([[0], [1]], [0, 1])
+    metrics = EvaluationService.evaluate(model, np.array([[0], [1], [1]]), np.array([0, 1, 2]))["metrics"]
+    assert metrics["roc_auc"] is None
+    assert metrics["log_loss"] is None
+
+
+@pytest.mark.parametrize("requested, expected", [(-5, 0), (0, 0), (10**9, MAX_BOOTSTRAP_SAMPLES)])
+def test_bootstrap_samples_are_clamped(requested: int, expected: int) -> None:
+    cm = np.array([[40, 10], [5, 45]])
+    intervals = EvaluationService.bootstrap_intervals(cm, n_bootstrap=requested, random_state=0)
+    assert intervals["n_bootstrap"] == expected
+    assert ("accuracy" in intervals) == (expected > 0)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+from typing import Any, List
+
+import pandas as pd
+import pytest
+
+from services.ingestion_service import IngestionService
+from services.storage import IngestionJob
+
+SHEETS = {
+    "duplicate-headers": [["a", "a", "a.1"], [1, 2, 3]],
+    "repeated-duplicates": [["x", "x.1", "x", "x", "x.2", None, None], [1, 2, 3, 4, 5, 6, 7]],
+    "unnamed-collision": [["b", None, "b", "Unnamed: 1"], [1, 2, 3, 4]],
+    "numeric-headers": [[1, 2.5, 3.0, None, "x", 1, "1"], [1, 2, 3, 4, 5, 6, 7]],
+    "typed-headers": [[datetime.datetime(2020, 1, 1), True, "y"], [1, 2, 3]],
+    "text-numbers": [["code", "value"], ["001", 1.5], ["002", 2.0], ["010", None]],
+    "blank-columns": [[None, "a", None, "b", None], [None, 1, None, 2, None], [None, 3, None, 4, None]],
+    "ragged-rows": [["a", "b", "c"], [1], [1, 2, 3, 4], [None, None, None], [5, "x"]],
+    "trailing-blank-rows": [["a", "b"], [1, "x"], [None, None], [None, None]],
+    "mixed-values": [["n", "s", "d"], [1, "NA", datetime.datetime(2021, 5, 1)], [2.25, "ok", None]],
+    "header-only": [["a", "b"]],
+}
+
+
+def _write(path: Path, rows: List[List[Any]]) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+
+@pytest.mark.parametrize("rows", list(SHEETS.values()), ids=list(SHEETS))
+def test_xlsx_matches_read_excel(tmp_path: Path, rows: List[List[Any]]) -> None:
+    path = tmp_path / "sheet.xlsx"
+    _write(path, rows)
+
+    df = IngestionService.read_dataframe(IngestionJob(job_id="ing_test", file_name=path.name), str(path))
+    expected = pd.read_excel(path)
+    pd.testing.assert_frame_equal(df, expected)
+    assert [type(c) for c in df.columns] == [type(c) for c in expected.columns]
+
+
+def test_xlsx_text_numbers_are_parsed_as_numbers(tmp_path: Path) -> None:
+    path = tmp_path / "codes.xlsx"
+    _write(path, SHEETS["text-numbers"])
+
+    df = IngestionService.read_dataframe(IngestionJob(job_id="ing_test", file_name=path.name), str(path))
+    assert df["code"].dtype == "int64"
+    assert df["code"].tolist() == [1, 2, 10]
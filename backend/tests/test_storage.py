@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, List
+
+import pandas as pd
+
+from services.storage import (
+    EXECUTION_COMPACT_AFTER_SECONDS,
+    EXECUTION_TTL_SECONDS,
+    STORE,
+    ExecutionState,
+    InMemoryStore,
+)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+def _finished_execution(store: InMemoryStore, finished_at: float) -> ExecutionState:
+    st = ExecutionState(execution_id=f"exec_{uuid.uuid4().hex}")
+    st.publish(status="success")
+    st.finished_at = finished_at
+    store.put_execution(st)
+    return st
+
+
+def test_hold_adopt_release_accounting() -> None:
+    store = InMemoryStore()
+    store.put_dataset("ds_in", _frame())
+    assert store.hold_dataset("ds_in")
+    assert not store.hold_dataset("ds_missing")
+    assert store.client_refcount("ds_in") == 1
+
+    # A client release leaves the execution's hold in place.
+    assert store.release_dataset("ds_in") is False
+    assert store.client_refcount("ds_in") == 0
+    assert store.release_dataset("ds_in") is False
+    assert store.has_dataset("ds_in")
+    assert store.release_dataset("ds_in", held=True) is True
+    assert not store.has_dataset("ds_in")
+
+    # An adopted intermediate has no client reference to drop.
+    store.put_dataset("ds_out", _frame())
+    store.adopt_dataset("ds_out")
+    assert store.client_refcount("ds_out") == 0
+    assert store.release_dataset("ds_out") is False
+    assert store.release_dataset("ds_out", held=True) is True
+    assert store.gc_metrics()["datasets_freed"] == 2
+
+
+def test_delete_is_refused_while_only_execution_holds_remain(client: Any) -> None:
+    dataset_id = f"ds_{uuid.uuid4().hex}"
+    STORE.put_dataset(dataset_id, _frame())
+    STORE.hold_dataset(dataset_id)
+
+    resp = client.delete(f"/api/data/{dataset_id}")
+    assert resp.status_code == 200
+    assert resp.get_json()["freed"] is False
+    assert client.delete(f"/api/data/{dataset_id}").status_code == 409
+    assert STORE.find_dataset(dataset_id) is not None
+
+    assert STORE.release_dataset(dataset_id, held=True) is True
+    assert client.delete(f"/api/data/{dataset_id}").status_code == 404
+
+
+def test_compaction_releases_owned_datasets_and_models_once() -> None:
+    store = InMemoryStore()
+    store.put_dataset("ds_in", _frame())
+    store.hold_dataset("ds_in")
+    store.release_dataset("ds_in")  # the client lets go; only the hold is left
+    store.put_dataset("ds_split", _frame())
+    store.adopt_dataset("ds_split")
+    store.put_model("model_1", {"model": object()})
+
+    finished_at = 1_000.0
+    st = _finished_execution(store, finished_at)
+    st.owned_datasets.extend(["ds_in", "ds_split"])
+    st.owned_models.append("model_1")
+
+    compacted: List[str] = []
+
+    def compact(state: ExecutionState) -> int:
+        compacted.append(state.execution_id)
+        return 0
+
+    now = finished_at + EXECUTION_COMPACT_AFTER_SECONDS
+    store.sweep_executions(compact, now=now - 1, force=True)
+    assert compacted == []
+    assert store.has_dataset("ds_in")
+
+    store.sweep_executions(compact, now=now, force=True)
+    store.sweep_executions(compact, now=now + 1, force=True)
+    assert compacted == [st.execution_id]
+    assert st.snapshot.compacted
+    assert not store.has_dataset("ds_in")
+    assert not store.has_dataset("ds_split")
+    assert not store.has_model("model_1")
+    assert store.has_execution(st.execution_id)
+
+    metrics = store.gc_metrics()
+    assert metrics["executions_compacted"] == 1
+    assert metrics["datasets_freed"] == 2
+    assert metrics["models_freed"] == 1
+
+
+def test_execution_expires_after_ttl() -> None:
+    store = InMemoryStore()
+    finished_at = 1_000.0
+    st = _finished_execution(store, finished_at)
+    running = ExecutionState(execution_id="exec_running")
+    store.put_execution(running)
+
+    store.sweep_executions(lambda state: 0, now=finished_at + EXECUTION_TTL_SECONDS - 1, force=True)
+    assert store.has_execution(st.execution_id)
+
+    store.sweep_executions(lambda state: 0, now=finished_at + EXECUTION_TTL_SECONDS, force=True)
+    assert not store.has_execution(st.execution_id)
+    assert store.find_execution("exec_running") is running
+    assert store.gc_metrics()["executions_expired"] == 1
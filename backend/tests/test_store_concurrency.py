@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+import pandas as pd
+import pytest
+
+from services.model_service import ModelService
+from services.preprocessing_service import PreprocessingService
+from services.storage import STORE, ExecutionState
+
+RUNS = 12
+POLLERS = 4
+NODE_RANK = {"queued": 0, "running": 1, "success": 2, "error": 2, "cancelled": 2}
+
+
+def _apply(dataset_id: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    time.sleep(0.001)
+    processed_id = f"ds_{uuid.uuid4().hex}"
+    STORE.put_dataset(processed_id, STORE.get_dataset(dataset_id).copy())
+    return {"processed_dataset_id": processed_id, "statistics": {"before": {}, "after": {}}}
+
+
+def _train(train_df: Any, test_df: Any, **kwargs: Any) -> Dict[str, Any]:
+    time.sleep(0.001)
+    if kwargs["hyperparameters"].get("fail"):
+        raise ValueError("training failed")
+    return {"model_id": f"model_{uuid.uuid4().hex}", "status": "success", "metrics": {"accuracy": 1.0}}
+
+
+@pytest.fixture
+def stub_services(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(PreprocessingService, "apply", staticmethod(_apply))
+    monkeypatch.setattr(ModelService, "train", staticmethod(_train))
+
+    publish = ExecutionState.publish
+
+    def publish_and_yield(self: ExecutionState, *args: Any, **kwargs: Any) -> Any:
+        snapshot = publish(self, *args, **kwargs)
+        # Pause between publishes so pollers also see every intermediate state.
+        time.sleep(0.0005)
+        return snapshot
+
+    monkeypatch.setattr(ExecutionState, "publish", publish_and_yield)
+
+
+def _pipeline(dataset_id: str, fail: bool) -> Dict[str, Any]:
+    nodes = [
+        {"id": "upload", "type": "dataUpload", "config": {"dataset_id": dataset_id}},
+        {"id": "prep", "type": "preprocessing", "config": {"operations": []}},
+        {"id": "split", "type": "trainTestSplit", "config": {"test_size": 0.25}},
+        {"id": "model", "type": "model", "config": {"target_column": "y", "hyperparameters": {"fail": fail}}},
+        {"id": "results", "type": "results", "config": {}},
+    ]
+    ids = [n["id"] for n in nodes]
+    connections = [{"source": a, "target": b} for a, b in zip(ids, ids[1:])]
+    return {"nodes": nodes, "connections": connections}
+
+
+def _check(body: Dict[str, Any], last: Dict[str, Any], violations: List[str]) -> None:
+    status = body["status"]
+    nodes = body["node_status"]
+    running = [nid for nid, s in nodes.items() if s == "running"]
+    if status in ("success", "error") and running:
+        violations.append(f"{status} with running nodes {running}")
+    if status == "success" and (
+        any(s != "success" for s in nodes.values()) or set(body["results_per_node"]) != set(nodes)
+    ):
+        violations.append(f"success with node statuses {nodes}")
+    if body["version"] < last.get("version", -1):
+        violations.append(f"version went back from {last['version']} to {body['version']}")
+    for nid, s in nodes.items():
+        if NODE_RANK[s] < NODE_RANK[last.get("node_status", {}).get(nid, "queued")]:
+            violations.append(f"node {nid} went back to {s}")
+
+
+def test_status_polls_see_consistent_snapshots(client: Any, stub_services: None) -> None:
+    from app import create_app
+
+    dataset_id = f"ds_{uuid.uuid4().hex}"
+    STORE.put_dataset(dataset_id, pd.DataFrame({"x": range(40), "y": [0, 1] * 20}))
+    violations: List[str] = []
+
+    def poll(execution_id: str, reads: List[int]) -> None:
+        poller = create_app().test_client()
+        last: Dict[str, Any] = {}
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            resp = poller.get(f"/api/pipeline/{execution_id}/status")
+            body = resp.get_json()
+            reads.append(1)
+            _check(body, last, violations)
+            last = body
+            if body["status"] in ("success", "error", "cancelled"):
+                return
+            # A short poll interval keeps the pollers from starving the runner of the GIL.
+            time.sleep(0.0005)
+        violations.append(f"{execution_id} did not finish")
+
+    for run in range(RUNS):
+        fail = run % 4 == 3
+        resp = client.post("/api/pipeline/execute", json=_pipeline(dataset_id, fail))
+        execution_id = resp.get_json()["execution_id"]
+
+        reads: List[int] = []
+        threads = [threading.Thread(target=poll, args=(execution_id, reads)) for _ in range(POLLERS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+
+        assert not any(t.is_alive() for t in threads)
+        assert not violations, violations[:5]
+        assert reads
+
+        final = client.get(f"/api/pipeline/{execution_id}/status").get_json()
+        if fail:
+            assert final["status"] == "error"
+            assert final["node_status"]["model"] == "error"
+        else:
+            assert final["status"] == "success"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import importlib
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+# Modules that dominate worker boot time. Services import them lazily on first use;
+# in preload mode the gunicorn master imports them once so forked workers share the
+# pages copy-on-write instead of each paying the import cost again.
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "sklearn.linear_model",
+    "sklearn.tree",
+    "sklearn.ensemble",
+    "scipy.stats",
+    "sklearn.preprocessing",
+    "sklearn.model_selection",
+)
+
+_PROCESS_T0 = time.perf_counter()
+
+_STARTUP: Dict[str, Any] = {
+    "pid": os.getpid(),
+    "preloaded": False,
+    "preload_seconds": None,
+    "app_ready_seconds": None,
+    "worker_boot_seconds": None,
+}
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def preload_heavy_modules() -> float:
+    t0 = time.perf_counter()
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    elapsed = time.perf_counter() - t0
+    _STARTUP["preloaded"] = True
+    _STARTUP["preload_seconds"] = elapsed
+    return elapsed
+
+
+def mark_app_ready() -> None:
+    _STARTUP["app_ready_seconds"] = time.perf_counter() - _PROCESS_T0
+
+
+def mark_worker_forked() -> None:
+    # Timings in a worker are measured from the fork, not from the master's start.
+    global _PROCESS_T0
+    _PROCESS_T0 = time.perf_counter()
+    _STARTUP["pid"] = os.getpid()
+
+
+def mark_worker_ready() -> None:
+    _STARTUP["worker_boot_seconds"] = time.perf_counter() - _PROCESS_T0
+
+
+def memory_usage() -> Dict[str, Optional[int]]:
+    """Resident memory of this process in bytes.
+
+    ``pss`` and ``shared`` come from /proc/self/smaps_rollup and are only
+    available on Linux; they show how much of the RSS is shared with the
+    gunicorn master when the app is preloaded.
+    """
+    usage: Dict[str, Optional[int]] = {"rss": None, "pss": None, "shared": None}
+
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields: Dict[str, int] = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+        usage["rss"] = fields.get("Rss")
+        usage["pss"] = fields.get("Pss")
+        usage["shared"] = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+        return usage
+    except OSError:
+        pass
+
+    try:
+        import resource
+
+        # ru_maxrss is KiB on Linux and bytes on macOS; this is a peak, not current RSS.
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["rss"] = maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+    except (ImportError, AttributeError):
+        pass
+    return usage
+
+
+def startup_report() -> Dict[str, Any]:
+    return {**_STARTUP, "memory": memory_usage()}
@@ -564,7 +564,7 @@ export function NodeConfigPanel() {
         <div className="space-y-4">
           <div className="flex items-center justify-between">
             <div className="text-sm font-medium">Model type</div>
-            <InfoTip content="Logistic Regression is a strong baseline linear classifier. Decision Trees learn rule-based splits and can provide feature importances." />
+            <InfoTip content="Logistic Regression is a strong baseline linear classifier. Decision Trees learn rule-based splits and can provide feature importances. Random Forest and Gradient Boosting are ensembles that train on multiple CPU cores." />
           </div>
 
           <RadioGroup
@@ -577,7 +577,14 @@ export function NodeConfigPanel() {
                 hyperparameters:
                   v === "logistic_regression"
                     ? { max_iter: d.hyperparameters?.max_iter ?? 200, C: d.hyperparameters?.C ?? 1.0 }
-                    : { max_depth: d.hyperparameters?.max_depth ?? undefined, min_samples_split: d.hyperparameters?.min_samples_split ?? 2, random_state: d.hyperparameters?.random_state ?? 42 },
+                    : v === "hist_gradient_boosting"
+                      ? { max_iter: 100, learning_rate: 0.1, max_depth: d.hyperparameters?.max_depth ?? undefined, random_state: d.hyperparameters?.random_state ?? 42 }
+                      : {
+                          max_depth: d.hyperparameters?.max_depth ?? undefined,
+                          min_samples_split: d.hyperparameters?.min_samples_split ?? 2,
+                          random_state: d.hyperparameters?.random_state ?? 42,
+                          ...(v === "random_forest" ? { n_estimators: d.hyperparameters?.n_estimators ?? 100 } : {}),
+                        },
               }))
             }
           >
@@ -589,6 +596,14 @@ export function NodeConfigPanel() {
               <RadioGroupItem value="decision_tree" />
               Decision Tree Classifier
             </label>
+            <label className="flex items-center gap-2 text-sm">
+              <RadioGroupItem value="random_forest" />
+              Random Forest
+            </label>
+            <label className="flex items-center gap-2 text-sm">
+              <RadioGroupItem value="hist_gradient_boosting" />
+              Gradient Boosting (histogram)
+            </label>
           </RadioGroup>
 
           {draft?.model_type === "logistic_regression" ? (
@@ -614,8 +629,50 @@ export function NodeConfigPanel() {
                 <div className="text-xs text-muted-foreground">Higher C = less regularization. Lower C = more regularization.</div>
               </div>
             </div>
+          ) : draft?.model_type === "hist_gradient_boosting" ? (
+            <div className="grid grid-cols-2 gap-3">
+              <div className="space-y-2">
+                <Label>max_iter</Label>
+                <Input
+                  type="number"
+                  disabled={isExecuting}
+                  value={draft?.hyperparameters?.max_iter ?? 100}
+                  onChange={(e) => setDraft((d: any) => ({ ...d, hyperparameters: { ...d.hyperparameters, max_iter: Number(e.target.value) } }))}
+                />
+              </div>
+              <div className="space-y-2">
+                <Label>learning_rate</Label>
+                <Input
+                  type="number"
+                  step="0.01"
+                  disabled={isExecuting}
+                  value={draft?.hyperparameters?.learning_rate ?? 0.1}
+                  onChange={(e) => setDraft((d: any) => ({ ...d, hyperparameters: { ...d.hyperparameters, learning_rate: Number(e.target.value) } }))}
+                />
+              </div>
+              <div className="space-y-2">
+                <Label>max_depth</Label>
+                <Input
+                  type="number"
+                  disabled={isExecuting}
+                  value={draft?.hyperparameters?.max_depth ?? ""}
+                  onChange={(e) => setDraft((d: any) => ({ ...d, hyperparameters: { ...d.hyperparameters, max_depth: e.target.value === "" ? undefined : Number(e.target.value) } }))}
+                />
+              </div>
+            </div>
           ) : (
             <div className="grid grid-cols-2 gap-3">
+              {draft?.model_type === "random_forest" ? (
+                <div className="space-y-2">
+                  <Label>n_estimators</Label>
+                  <Input
+                    type="number"
+                    disabled={isExecuting}
+                    value={draft?.hyperparameters?.n_estimators ?? 100}
+                    onChange={(e) => setDraft((d: any) => ({ ...d, hyperparameters: { ...d.hyperparameters, n_estimators: Number(e.target.value) } }))}
+                  />
+                </div>
+              ) : null}
               <div className="space-y-2">
                 <Label>max_depth</Label>
                 <Input
@@ -675,6 +732,20 @@ export function NodeConfigPanel() {
     const cm = result?.confusion_matrix as number[][] | undefined
     const report = result?.classification_report as any
     const importance = result?.feature_importance as { features: string[]; importances: number[] } | undefined
+    const intervals = result?.confidence_intervals as Record<string, unknown> | undefined
+
+    const renderInterval = (name: string, format: (value: number) => string) => {
+      const bounds = intervals?.[name]
+      if (!Array.isArray(bounds) || bounds.length !== 2) return null
+      const level = Number(intervals?.level ?? 0.95)
+      return (
+        <div className="text-xs font-normal text-muted-foreground">
+          {Math.round(level * 100)}% CI {format(bounds[0])} – {format(bounds[1])}
+        </div>
+      )
+    }
+    const formatPercent = (value: number) => `${(value * 100).toFixed(2)}%`
+    const formatScore = (value: number) => value.toFixed(4)
 
     const rows = importance
       ? importance.features
@@ -692,6 +763,8 @@ export function NodeConfigPanel() {
         `precision,${metrics?.precision ?? ""}`,
         `recall,${metrics?.recall ?? ""}`,
         `f1,${metrics?.f1 ?? ""}`,
+        `roc_auc,${metrics?.roc_auc ?? ""}`,
+        `log_loss,${metrics?.log_loss ?? ""}`,
       ]
       downloadText("metrics.csv", lines.join("\n"), "text/csv")
     }
@@ -724,13 +797,45 @@ export function NodeConfigPanel() {
               <Card className="p-4">
                 <div className="grid grid-cols-2 gap-3 text-sm">
                   <div>Accuracy</div>
-                  <div className="text-right font-medium">{(Number(metrics?.accuracy ?? 0) * 100).toFixed(2)}%</div>
+                  <div className="text-right font-medium">
+                    {formatPercent(Number(metrics?.accuracy ?? 0))}
+                    {renderInterval("accuracy", formatPercent)}
+                  </div>
                   <div>Precision</div>
-                  <div className="text-right font-medium">{Number(metrics?.precision ?? 0).toFixed(4)}</div>
+                  <div className="text-right font-medium">
+                    {formatScore(Number(metrics?.precision ?? 0))}
+                    {renderInterval("precision", formatScore)}
+                  </div>
                   <div>Recall</div>
-                  <div className="text-right font-medium">{Number(metrics?.recall ?? 0).toFixed(4)}</div>
+                  <div className="text-right font-medium">
+                    {formatScore(Number(metrics?.recall ?? 0))}
+                    {renderInterval("recall", formatScore)}
+                  </div>
                   <div>F1</div>
-                  <div className="text-right font-medium">{Number(metrics?.f1 ?? 0).toFixed(4)}</div>
+                  <div className="text-right font-medium">
+                    {formatScore(Number(metrics?.f1 ?? 0))}
+                    {renderInterval("f1", formatScore)}
+                  </div>
+                  {typeof metrics?.roc_auc === "number" ? (
+                    <>
+                      <div>ROC-AUC</div>
+                      <div className="text-right font-medium">{metrics.roc_auc.toFixed(4)}</div>
+                    </>
+                  ) : null}
+                  {typeof metrics?.log_loss === "number" ? (
+                    <>
+                      <div>Log loss</div>
+                      <div className="text-right font-medium">{metrics.log_loss.toFixed(4)}</div>
+                    </>
+                  ) : null}
+                  {result?.cpu_allocation ? (
+                    <>
+                      <div>CPU threads</div>
+                      <div className="text-right font-medium">
+                        {result.cpu_allocation.threads} / {result.cpu_allocation.cpu_total}
+                      </div>
+                    </>
+                  ) : null}
                 </div>
               </Card>
               {report ? (
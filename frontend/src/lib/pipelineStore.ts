@@ -32,7 +32,7 @@ type TrainTestSplitConfig = {
 }
 
 type ModelConfig = {
-  model_type: "logistic_regression" | "decision_tree"
+  model_type: "logistic_regression" | "decision_tree" | "random_forest" | "hist_gradient_boosting"
   target_column?: string
   feature_columns: string[]
   hyperparameters: {
@@ -40,6 +40,8 @@ type ModelConfig = {
     C?: number
     max_depth?: number
     min_samples_split?: number
+    n_estimators?: number
+    learning_rate?: number
     random_state?: number
   }
 }
@@ -69,6 +71,16 @@ type ExecutionSnapshot = {
   results_per_node: Record<string, unknown>
 }
 
+type IngestionSnapshot = {
+  job_id: string
+  status: "queued" | "running" | "success" | "error" | "cancelled"
+  message?: string
+  dataset_id?: string
+  info?: DatasetInfo
+}
+
+const INGESTION_POLL_MS = 500
+
 type PipelineState = {
   nodes: PipelineNode[]
   edges: PipelineEdge[]
@@ -292,10 +304,18 @@ export const usePipelineStore = create<PipelineState>((set, get) => ({
       headers: { "Content-Type": "multipart/form-data" },
     })
 
-    const dataset_id = res.data.dataset_id as string
-    const info = res.data.info as DatasetInfo
+    // The backend parses in the background; poll the ingestion job until it settles.
+    let job = res.data as IngestionSnapshot
+    while (job.status === "queued" || job.status === "running") {
+      await new Promise((resolve) => window.setTimeout(resolve, INGESTION_POLL_MS))
+      const poll = await api.get(`/api/data/ingestions/${job.job_id}`)
+      job = poll.data as IngestionSnapshot
+    }
+    if (job.status !== "success" || !job.dataset_id || !job.info) {
+      throw new Error(job.message || "Failed to parse file")
+    }
 
-    get().updateNodeConfig(nodeId, { fileName: file.name, dataset_id, info })
+    get().updateNodeConfig(nodeId, { fileName: file.name, dataset_id: job.dataset_id, info: job.info })
   },
 
   loadSampleDataset: async (nodeId, filename) => {